@@ -0,0 +1 @@
+Retry GET and other idempotent requests up to 3 times with backoff on 500, 502, 503 and 504 responses. POST requests are never retried.
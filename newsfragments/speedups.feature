@@ -0,0 +1 @@
+Add a speedups extra (pip install pyrh[speedups]) that uses orjson to decode responses and to read and write the session cache.
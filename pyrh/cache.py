@@ -1,26 +1,34 @@
 """Project config/cache files."""
 
+import json
+import os
+import tempfile
 from json import JSONDecodeError
 from pathlib import Path
 from typing import Optional, Union, cast
 
+from marshmallow import ValidationError
+
 from pyrh.exceptions import InvalidCacheFile
 from pyrh.robinhood import Robinhood, RobinhoodSchema
 
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+_ROBINHOOD_SCHEMA = RobinhoodSchema()
+
 CACHE_ROOT: Path = Path("~/.robinhood").expanduser()
 """The root directory where cache and config files are stores.
 
-Creates the directory on import.
+Created the first time a session is dumped.
 """
-CACHE_ROOT.mkdir(parents=True, exist_ok=True)
 
 CACHE_LOGIN: Path = CACHE_ROOT.joinpath("login.json")
-"""Path to login.json config file.
-
-Creates the file on import.
-"""
-CACHE_LOGIN.touch(exist_ok=True)
+"""Path to login.json config file."""
 
 # TODO: Fix darglint issue (remove from flake8 ignore)
 # https://github.com/terrencepreilly/darglint/issues/81
@@ -31,18 +39,36 @@ def dump_session(robinhood: Robinhood, path: Optional[Union[Path, str]] = None)
 
     Note:
         This function defaults to caching this information to
-        ~/.robinhood/login.json
+        ~/.robinhood/login.json. If the optional `orjson` package is installed it
+        is used to serialize the file, otherwise the standard library is used.
 
     Args:
         robinhood: A Robinhood instance.
         path: The location to save the file and its name.
 
     """
-    path = CACHE_LOGIN if path is None else path
-    json_str = RobinhoodSchema().dumps(robinhood, indent=4)
-
-    with open(path, "w+") as file:
-        file.write(json_str)
+    path = CACHE_LOGIN if path is None else Path(path)
+    data = _ROBINHOOD_SCHEMA.dump(robinhood)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        # match orjson's output so the file does not depend on the installed extra
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode()
+
+    # write to a uniquely named file next to the cache and swap it in, so a crash
+    # never leaves a partial cache and concurrent dumps never share a temp file
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
 
 
 def load_session(path: Optional[Union[Path, str]] = None) -> Robinhood:
@@ -62,11 +88,12 @@ def load_session(path: Optional[Union[Path, str]] = None) -> Robinhood:
         InvalidCacheFile: If the cache file cannot be decoded or does not exist
 
     """
-    path = path or CACHE_LOGIN
+    path = CACHE_LOGIN if path is None else Path(path)
     try:
-        with open(path) as file:
-            return cast(Robinhood, RobinhoodSchema().loads(file.read()))
-    except (JSONDecodeError, FileNotFoundError):
+        raw = path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        return cast(Robinhood, _ROBINHOOD_SCHEMA.load(data))
+    except (JSONDecodeError, FileNotFoundError, ValidationError):
         raise InvalidCacheFile(
             f"The cache file at {path} is invalid or does not exist."
         )
@@ -178,8 +178,7 @@ def base_paginator(seed_url: "URL", session_manager: "SessionManager", schema: A
     resource_endpoint = seed_url
     while True:
         paginator = session_manager.get(resource_endpoint, schema=schema)
-        for instrument in paginator:
-            yield instrument
+        yield from paginator
         if paginator.next is not None:
             resource_endpoint = paginator.next
         else:
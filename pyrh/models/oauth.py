@@ -1,6 +1,7 @@
 """Oauth models."""
 
 from datetime import datetime
+from typing import FrozenSet
 
 import pytz
 from marshmallow import fields, validate
@@ -8,7 +9,8 @@ from marshmallow import fields, validate
 from .base import BaseModel, BaseSchema
 
 
-CHALLENGE_TYPE_VAL = validate.OneOf(["email", "sms"])
+CHALLENGE_TYPES: FrozenSet[str] = frozenset({"email", "sms"})
+CHALLENGE_TYPE_VAL = validate.OneOf(sorted(CHALLENGE_TYPES))
 
 
 class Challenge(BaseModel):
@@ -9,15 +9,23 @@ import certifi
 import pytz
 import requests
 from marshmallow import Schema, fields, post_load
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
 from yarl import URL
 
 from pyrh import urls
 from pyrh.exceptions import AuthenticationError, PyrhValueError
 
 from .base import JSON, BaseModel, BaseSchema
-from .oauth import CHALLENGE_TYPE_VAL, OAuth, OAuthSchema
+from .oauth import CHALLENGE_TYPE_VAL, CHALLENGE_TYPES, OAuth, OAuthSchema
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 
 # TODO: merge get and post duplicated code into a single function.
@@ -53,6 +61,47 @@ EXPIRATION_TIME: int = 734000
 TIMEOUT: int = 1
 """Default timeout in seconds"""
 
+RETRIES: Retry = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 503, 504),
+    raise_on_status=False,
+)
+"""Retry policy for transient errors.
+
+Up to 3 retries (4 attempts in total). Only idempotent methods retry, never POST.
+"""
+
+EXPIRED_AT: datetime = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+"""Default `expires_at` before login, some time in the past."""
+
+# Schema construction copies every declared field, build the one used by the login
+# flow once and share it (loading does not mutate the schema).
+_OAUTH_SCHEMA = OAuthSchema()
+
+
+def _decode_json(res: requests.Response) -> Any:
+    """Decode the JSON body of a response.
+
+    Uses `orjson` on the raw bytes when it is installed, otherwise falls back to
+    `requests.Response.json`. Invalid bodies always raise the error of
+    `requests.Response.json`, whichever decoder is in use.
+
+    Args:
+        res: The response to decode.
+
+    Returns:
+        The decoded JSON payload.
+
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(res.content)
+        except ValueError:
+            # orjson's error is a ValueError, let requests raise its own instead
+            pass
+    return res.json()
+
 
 class SessionManager(BaseModel):
     """Mange connectivity with Robinhood API.
@@ -109,16 +158,16 @@ class SessionManager(BaseModel):
         **kwargs: Any,
     ) -> None:
         self.session: requests.Session = requests.session()
-        self.session.headers = HEADERS if headers is None else headers
+        # copy the defaults, auth headers are set per session and must not leak
+        self.session.headers = HEADERS.copy() if headers is None else headers
         self.session.proxies = getproxies() if proxies is None else proxies
         self.session.verify = certifi.where()
-        self.expires_at = datetime.strptime("1970", "%Y").replace(
-            tzinfo=pytz.UTC
-        )  # some time in the past
+        self.session.mount("https://", HTTPAdapter(max_retries=RETRIES))
+        self.expires_at = EXPIRED_AT
 
         self.username: str = username
         self.password: str = password
-        if challenge_type not in ["email", "sms"]:
+        if challenge_type not in CHALLENGE_TYPES:
             raise ValueError("challenge_type must be email or sms")
         self.challenge_type: str = challenge_type
 
@@ -230,9 +279,11 @@ class SessionManager(BaseModel):
         if raise_errors:
             res.raise_for_status()
 
-        data = res.json() if schema is None else schema.load(res.json(), many=many)
+        decoded = _decode_json(res)
+        if schema is not None:
+            decoded = schema.load(decoded, many=many)
 
-        return (data, res) if return_response else data
+        return (decoded, res) if return_response else decoded
 
     def post(
         self,
@@ -294,9 +345,11 @@ class SessionManager(BaseModel):
         if raise_errors:
             res.raise_for_status()
 
-        data = res.json() if schema is None else schema.load(res.json(), many=many)
+        decoded = _decode_json(res)
+        if schema is not None:
+            decoded = schema.load(decoded, many=many)
 
-        return (data, res) if return_response else data
+        return (decoded, res) if return_response else decoded
 
     def _configure_manager(self, oauth: OAuth) -> None:
         """Process an authentication response dictionary.
@@ -352,7 +405,7 @@ class SessionManager(BaseModel):
             headers=challenge_header,
             auto_login=False,
             return_response=True,
-            schema=OAuthSchema(),
+            schema=_OAUTH_SCHEMA,
         )
         if res.status_code == requests.codes.ok:
             try:
@@ -364,7 +417,7 @@ class SessionManager(BaseModel):
                         data=oauth_payload,
                         headers=challenge_header,
                         auto_login=False,
-                        schema=OAuthSchema(),
+                        schema=_OAUTH_SCHEMA,
                     ),
                 )
             except HTTPError:
@@ -401,7 +454,7 @@ class SessionManager(BaseModel):
             raise_errors=False,
             auto_login=False,
             return_response=True,
-            schema=OAuthSchema(),
+            schema=_OAUTH_SCHEMA,
         )
         attempts -= 1
         if (res.status_code != requests.codes.ok) and (attempts > 0):
@@ -439,7 +492,7 @@ class SessionManager(BaseModel):
             data=oauth_payload,
             raise_errors=False,
             auto_login=False,
-            schema=OAuthSchema(),
+            schema=_OAUTH_SCHEMA,
         )
 
         if oauth.is_challenge:
@@ -481,7 +534,7 @@ class SessionManager(BaseModel):
                 urls.OAUTH,
                 data=relogin_payload,
                 auto_login=False,
-                schema=OAuthSchema(),
+                schema=_OAUTH_SCHEMA,
             )
         except HTTPError:
             raise AuthenticationError("Failed to refresh token")
@@ -1,5 +1,6 @@
 """robinhood.py: a collection of utilities for working with Robinhood's Private API."""
 
+import logging
 from enum import Enum
 from urllib.parse import unquote
 
@@ -17,6 +18,8 @@ from pyrh.models import (
 )
 
 
+logger = logging.getLogger(__name__)
+
 # TODO: re-enable InvalidOptionId when broken endpoint function below is fixed
 
 
@@ -121,9 +124,10 @@ class Robinhood(InstrumentManager, SessionManager):
 
         """
 
+        keys = key.split(",")
+
         # Creates a tuple containing the information we want to retrieve
         def append_stock(stock):
-            keys = key.split(",")
             myStr = ""
             for item in keys:
                 myStr += f"{stock[item]},"
@@ -514,12 +518,9 @@ class Robinhood(InstrumentManager, SessionManager):
         else:
             _expiration_dates_string = expiration_dates
         chain_id = self.get_url(urls.build_chain(instrument_id))["results"][0]["id"]
-        return [
-            contract
-            for contract in self.get_url(
-                urls.options(chain_id, _expiration_dates_string, option_type)
-            )["results"]
-        ]
+        return self.get_url(
+            urls.options(chain_id, _expiration_dates_string, option_type)
+        )["results"]
 
     # TODO: the endpoint `option_market_data` doesn't exist
     # def get_option_market_data(self, optionid):
@@ -1132,7 +1133,7 @@ class Robinhood(InstrumentManager, SessionManager):
             try:
                 self.auth_method
             except:  # noqa: E722
-                print(ex)
+                logger.error("Order request failed: %s", ex)
 
     # TODO: Fix function complexity
     def submit_buy_order(  # noqa: C901
@@ -1313,7 +1314,7 @@ class Robinhood(InstrumentManager, SessionManager):
             try:
                 self.auth_method
             except:  # noqa: E722
-                print(ex)
+                logger.error("Order request failed: %s", ex)
 
     def place_order(
         self,
@@ -1378,7 +1379,7 @@ class Robinhood(InstrumentManager, SessionManager):
             try:
                 self.auth_method
             except:  # noqa: E722
-                print(ex)
+                logger.error("Order request failed: %s", ex)
 
     def place_buy_order(self, instrument, quantity, ask_price=0.0):
         """Wrapper for placing buy orders
@@ -1442,13 +1443,9 @@ class Robinhood(InstrumentManager, SessionManager):
             order history?
         """
 
-        open_orders = []
         orders = self.order_history()
-        for order in orders["results"]:
-            if order["cancel"] is not None:
-                open_orders.append(order)
 
-        return open_orders
+        return [order for order in orders["results"] if order["cancel"] is not None]
 
     ##############################
     #        CANCEL ORDER        #
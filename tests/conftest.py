@@ -1,3 +1,26 @@
+"""Shared pytest fixtures."""
+
+import socket
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def block_network():
+    # Every request in the suite is mocked, fail fast if one escapes instead of
+    # waiting on a real DNS lookup or TLS handshake.
+    def guard(*args, **kwargs):
+        raise RuntimeError("Network access is disabled in tests")
+
+    real_getaddrinfo = socket.getaddrinfo
+    real_connect = socket.socket.connect
+    socket.getaddrinfo = guard
+    socket.socket.connect = guard
+    yield
+    socket.getaddrinfo = real_getaddrinfo
+    socket.socket.connect = real_connect
+
+
 # #!/usr/bin/env python3
 # """configtest.py: setup pytest defaults/extensions"""
 #
@@ -1,9 +1,9 @@
 """Test the oauth classes."""
 
-from freezegun import freeze_time
+import time_machine
 
 
-@freeze_time("2020-01-01")
+@time_machine.travel("2020-01-01", tick=False)
 def test_challenge_can_retry():
     from copy import copy
 
@@ -1,47 +1,165 @@
 """Test session manager"""
 
+# pytest -n auto-safe: the shared session manager and its canned response adapter are
+# module scoped, so every xdist worker builds its own copy, and sm_adap resets them
+# before each test. Keep any new shared state per module and reset it the same way.
+# Tests of constructor defaults use the per-test sm fixture, never the shared one.
+
+import json
+import re
+import uuid
+from contextlib import contextmanager
 from unittest import mock
 
 import pytest
-import requests_mock
-from freezegun import freeze_time
+import requests
+import time_machine
+from requests.adapters import HTTPAdapter
 
 
 MOCK_URL = "mock://test.com"
+MOCK_OAUTH = MOCK_URL + "/oauth2/token/"
+MOCK_REVOKE = MOCK_URL + "/oauth2/revoke_token/"
+INPUT_CODE = "123456"
+SAMPLE_USER = {
+    "username": "user@example.com",
+    "password": "some password",
+}
+
+# messages matched by more than one test. Keep every match= pattern in this module a
+# plain literal, never an f-string: literal prefixes let re.search skip ahead with a
+# substring scan, and an interpolated value could smuggle in regex metacharacters.
+CACHE_FILE_ERROR = re.compile("The cache file at")
+NOT_FOUND_ERROR = re.compile("404 Client Error")
+
+TOKEN_OK = {
+    "access_token": "some_token",
+    "expires_in": 876880,
+    "token_type": "Bearer",
+    "scope": "internal",
+    "refresh_token": "some_refresh_token",
+    "mfa_code": None,
+    "backup_code": None,
+}
 
 # TODO: refactor this to remove internal method testing and only test the public methods
 
 
-@pytest.fixture
-def sm():
+def fake_input(*args):
+    return INPUT_CODE
+
+
+def fake_build_challenge(challenge_id):
+    return f"{MOCK_URL}/challenge/{challenge_id}/respond/"
+
+
+class CannedAdapter(HTTPAdapter):
+    # Answers every request with the next queued response, in order, and records the
+    # (method, url) of each request in sent so tests can check where the flow went.
+    def __init__(self, responses=()):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append((request.method, request.url))
+        canned = self.responses.pop(0)
+        body = canned["text"] if "text" in canned else json.dumps(canned["json"])
+
+        response = requests.Response()
+        response.status_code = canned["status_code"]
+        response.headers["Content-Type"] = "application/json"
+        response.encoding = "utf-8"
+        response._content = body.encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+
+@contextmanager
+def raises_auth_error(match):
+    # hide this helper's frame so failures point at the calling test
+    __tracebackhide__ = True
+    from pyrh.exceptions import AuthenticationError
+
+    with pytest.raises(AuthenticationError, match=match):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def stub_input(monkeypatch):
+    # challenge and mfa flows prompt for a code, never block on stdin
+    import builtins
+
+    monkeypatch.setattr(builtins, "input", fake_input)
+
+
+# pyrh is only imported inside fixtures and tests so that collecting this module
+# (--collect-only, -k deselection, IDE discovery) does not import the package.
+@pytest.fixture(scope="module")
+def shared_sm():
+    from pyrh import urls
     from pyrh.models import SessionManager
 
-    sample_user = {
-        "username": "user@example.com",
-        "password": "some password",
-    }
+    with mock.patch.object(urls, "OAUTH", MOCK_OAUTH), mock.patch.object(
+        urls, "OAUTH_REVOKE", MOCK_REVOKE
+    ), mock.patch.object(urls, "build_challenge", fake_build_challenge):
+        yield SessionManager(**SAMPLE_USER), CannedAdapter()
+
 
-    return SessionManager(**sample_user)
+@pytest.fixture
+def sm_adap(shared_sm):
+    # reset the per-test state of the module wide session manager and mock queue,
+    # tests queue the responses they expect and each request pops the next one
+    from pyrh.models import OAuth
+    from pyrh.models.sessionmanager import EXPIRED_AT, HEADERS
+
+    session_manager, adapter = shared_sm
+    session_manager.username = SAMPLE_USER["username"]
+    session_manager.password = SAMPLE_USER["password"]
+    session_manager.oauth = OAuth()
+    session_manager.expires_at = EXPIRED_AT
+    session_manager.session.headers = HEADERS.copy()
+    session_manager.session.mount("mock", adapter)
+    adapter.responses.clear()
+    adapter.sent.clear()
+
+    return session_manager, adapter.responses
 
 
 @pytest.fixture
-def sm_adap(monkeypatch):
+def sent(shared_sm, sm_adap):
+    # (method, url) of every request the shared session manager made in this test
+    return shared_sm[1].sent
+
+
+@pytest.fixture
+def sm():
+    # a fresh instance, tests using it check constructor defaults (headers, expiry)
+    # which the shared instance behind sm_adap has overwritten by its reset
     from pyrh.models import SessionManager
 
-    sample_user = {
-        "username": "user@example.com",
-        "password": "some password",
-    }
+    return SessionManager(**SAMPLE_USER)
 
-    monkeypatch.setattr("pyrh.urls.OAUTH", MOCK_URL)
-    monkeypatch.setattr("pyrh.urls.OAUTH_REVOKE", MOCK_URL)
-    monkeypatch.setattr("pyrh.urls.build_challenge", lambda x: MOCK_URL)
 
-    session_manager = SessionManager(**sample_user)
-    adapter = requests_mock.Adapter()
-    session_manager.session.mount("mock", adapter)
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    # run a test with each json decoder, orjson is skipped when it is not installed
+    import pyrh.cache
+    import pyrh.models.sessionmanager
+
+    orjson = pytest.importorskip("orjson") if request.param == "orjson" else None
+    monkeypatch.setattr(pyrh.cache, "orjson", orjson)
+    monkeypatch.setattr(pyrh.models.sessionmanager, "orjson", orjson)
+
+    return request.param
+
 
-    return session_manager, adapter
+@pytest.fixture
+def oauth():
+    from pyrh.models import OAuth
+
+    return OAuth(access_token="some_token", refresh_token="some_refresh_token")
 
 
 def test_repr(sm):
@@ -51,43 +169,116 @@ def test_repr(sm):
 def test_bad_challenge_type(sm):
     from pyrh.models import SessionManager
 
-    sample_user = {
-        "username": "user@example.com",
-        "password": "some password",
-    }
+    with pytest.raises(ValueError, match="challenge_type must be"):
+        SessionManager(**SAMPLE_USER, challenge_type="bad")
+
+
+def test_default_headers_not_shared(sm):
+    from pyrh.models import SessionManager
+    from pyrh.models.sessionmanager import HEADERS
 
-    with pytest.raises(ValueError) as e:
-        SessionManager(**sample_user, challenge_type="bad")
+    sm.session.headers["Authorization"] = "Bearer some_token"
+    other = SessionManager(username="other@example.com", password="some password")
 
-    assert "challenge_type must be" in str(e.value)
+    assert "Authorization" not in HEADERS
+    assert "Authorization" not in other.session.headers
 
 
-def test_login_oauth2_errors(monkeypatch, sm_adap):
-    from pyrh.exceptions import AuthenticationError
+def test_retry_adapter_mounted(sm):
+    from pyrh.models.sessionmanager import RETRIES
 
-    sm, adapter = sm_adap
+    adapter = sm.session.get_adapter("https://api.robinhood.com/")
 
-    # Note it is not possible to get invalid results to replace
-    # oauth from the mfa approaches as those individual functions will error
-    # out themselves
+    assert adapter.max_retries is RETRIES
+    # retrying a POST after a 5xx could submit an order twice
+    assert not RETRIES.is_retry("POST", 503)
+    assert RETRIES.is_retry("GET", 503)
 
-    adapter.register_uri(
-        "POST", MOCK_URL, text='{"error": "Some error"}', status_code=400
-    )
-    with pytest.raises(AuthenticationError) as e:
+
+def challenge_response(detail, status, remaining_attempts):
+    return {
+        "detail": detail,
+        "challenge": {
+            "id": str(uuid.uuid4()),
+            "user": str(uuid.uuid4()),
+            "type": "email",
+            "alternate_type": "sms",
+            "status": status,
+            "remaining_retries": 3,
+            "remaining_attempts": remaining_attempts,
+            "expires_at": "2010-01-01T00:00:00+00:00",
+        },
+    }
+
+
+# Note it is not possible to get invalid results to replace oauth from the mfa
+# approaches as those individual functions will error out themselves
+@time_machine.travel("2005-01-01", tick=False)
+@pytest.mark.parametrize(
+    "responses, message",
+    [
+        ([{"json": {"error": "Some error"}, "status_code": 400}], "Some error"),
+        (
+            [
+                {
+                    "json": challenge_response(
+                        "Request blocked, challenge issued.", "issued", 3
+                    ),
+                    "status_code": 401,
+                },
+                {
+                    "json": challenge_response(
+                        "Challenge response is invalid.", "issued", 2
+                    ),
+                    "status_code": 401,
+                },
+                {
+                    "json": challenge_response(
+                        "Challenge response is invalid.", "issued", 1
+                    ),
+                    "status_code": 401,
+                },
+                {
+                    "json": challenge_response("Some message.", "failed", 0),
+                    "status_code": 401,
+                },
+            ],
+            "Exceeded available",
+        ),
+        (
+            [
+                {"json": {"mfa_required": True, "mfa_type": "app"}, "status_code": 200},
+                {"json": {"detail": "Please enter a valid code"}, "status_code": 401},
+                {"json": {"detail": "Please enter a valid code"}, "status_code": 401},
+                {"json": {"detail": "Please enter a valid code"}, "status_code": 401},
+            ],
+            "Too many incorrect",
+        ),
+    ],
+    ids=["error", "challenge", "mfa"],
+)
+def test_login_oauth2_failure(sm_adap, sent, responses, message):
+    sm, pending = sm_adap
+    pending.extend(responses)
+    with raises_auth_error(message):
         sm._login_oauth2()
 
-    assert "Some error" in str(e.value)
+    # challenge answers go to the challenge url, retried mfa codes back to oauth
+    first = responses[0]["json"]
+    follow_up = (
+        fake_build_challenge(first["challenge"]["id"])
+        if "challenge" in first
+        else MOCK_OAUTH
+    )
+    assert sent == [("POST", MOCK_OAUTH)] + [("POST", follow_up)] * (len(responses) - 1)
 
 
-@freeze_time("2005-01-01")
-def test_login_oauth2_challenge_valid(monkeypatch, sm_adap):
-    import uuid
+@time_machine.travel("2005-01-01", tick=False)
+def test_login_oauth2_challenge_valid(sm_adap, sent):
     from datetime import datetime
     import pytz
     from pyrh.models.oauth import OAuthSchema
 
-    monkeypatch.setattr("builtins.input", lambda: "123456")
     expiry = datetime.strptime("2010", "%Y").replace(tzinfo=pytz.UTC)
     responses = [
         {
@@ -113,204 +304,73 @@ def test_login_oauth2_challenge_valid(monkeypatch, sm_adap):
             "remaining_attempts": 0,
             "expires_at": expiry,
         },
-        {
-            "access_token": "some_token",
-            "expires_in": 876880,
-            "token_type": "Bearer",
-            "scope": "internal",
-            "refresh_token": "some_refresh_token",
-            "mfa_code": None,
-            "backup_code": None,
-        },
+        TOKEN_OK,
     ]
     expected = [
         {"text": OAuthSchema().dumps(responses[0]), "status_code": 401},
         {"text": OAuthSchema().dumps(responses[1]), "status_code": 200},
         {"text": OAuthSchema().dumps(responses[2]), "status_code": 200},
     ]
-    sm, adapter = sm_adap
-    adapter.register_uri("POST", MOCK_URL, expected)
+    sm, pending = sm_adap
+    pending.extend(expected)
     sm._login_oauth2()
 
     assert sm.oauth.is_valid
-
-
-@freeze_time("2005-01-01")
-def test_login_oauth2_challenge_invalid(monkeypatch, sm_adap):
-    from pyrh.exceptions import AuthenticationError
-    from datetime import datetime
-    from pyrh.models.oauth import OAuthSchema
-    import pytz
-    import uuid
-
-    monkeypatch.setattr("builtins.input", lambda: "123456")
-    expiry = datetime.strptime("2010", "%Y").replace(tzinfo=pytz.UTC)
-    responses = [
-        {
-            "detail": "Request blocked, challenge issued.",
-            "challenge": {
-                "id": str(uuid.uuid4()),
-                "user": str(uuid.uuid4()),
-                "type": "email",
-                "alternate_type": "sms",
-                "status": "issued",
-                "remaining_retries": 3,
-                "remaining_attempts": 3,
-                "expires_at": expiry,
-            },
-        },
-        {
-            "detail": "Challenge response is invalid.",
-            "challenge": {
-                "id": str(uuid.uuid4()),
-                "user": str(uuid.uuid4()),
-                "type": "email",
-                "alternate_type": "sms",
-                "status": "issued",
-                "remaining_retries": 3,
-                "remaining_attempts": 2,
-                "expires_at": expiry,
-            },
-        },
-        {
-            "detail": "Challenge response is invalid.",
-            "challenge": {
-                "id": str(uuid.uuid4()),
-                "user": str(uuid.uuid4()),
-                "type": "email",
-                "alternate_type": "sms",
-                "status": "issued",
-                "remaining_retries": 3,
-                "remaining_attempts": 1,
-                "expires_at": expiry,
-            },
-        },
-        {
-            "detail": "Some message.",
-            "challenge": {
-                "id": str(uuid.uuid4()),
-                "user": str(uuid.uuid4()),
-                "type": "email",
-                "alternate_type": "sms",
-                "status": "failed",
-                "remaining_retries": 3,
-                "remaining_attempts": 0,
-                "expires_at": expiry,
-            },
-        },
-    ]
-    expected = [
-        {"text": OAuthSchema().dumps(responses[0]), "status_code": 401},
-        {"text": OAuthSchema().dumps(responses[1]), "status_code": 401},
-        {"text": OAuthSchema().dumps(responses[2]), "status_code": 401},
-        {"text": OAuthSchema().dumps(responses[3]), "status_code": 401},
+    assert sent == [
+        ("POST", MOCK_OAUTH),
+        ("POST", fake_build_challenge(responses[0]["challenge"]["id"])),
+        ("POST", MOCK_OAUTH),
     ]
-    sm, adapter = sm_adap
-    adapter.register_uri("POST", MOCK_URL, expected)
-    with pytest.raises(AuthenticationError) as e:
-        sm._login_oauth2()
 
-    assert "Exceeded available" in str(e.value)
 
-
-def test_login_oauth2_mfa_valid(monkeypatch, sm_adap):
+def test_login_oauth2_mfa_valid(sm_adap, sent):
     from pyrh.models.oauth import OAuthSchema
 
-    mfa_code = "123456"
-    monkeypatch.setattr("builtins.input", lambda: mfa_code)
     responses = [
         {"mfa_required": True, "mfa_type": "app"},
-        {
-            "access_token": "some_token",
-            "expires_in": 876880,
-            "token_type": "Bearer",
-            "scope": "internal",
-            "refresh_token": "some_refresh_token",
-            "mfa_code": mfa_code,
-            "backup_code": None,
-        },
+        {**TOKEN_OK, "mfa_code": INPUT_CODE},
     ]
     expected = [
         {"text": OAuthSchema().dumps(responses[0]), "status_code": 200},
         {"text": OAuthSchema().dumps(responses[1]), "status_code": 200},
     ]
-    sm, adapter = sm_adap
-    adapter.register_uri("POST", MOCK_URL, expected)
+    sm, pending = sm_adap
+    pending.extend(expected)
     sm._login_oauth2()
 
     assert sm.oauth.is_valid
+    assert sent == [("POST", MOCK_OAUTH), ("POST", MOCK_OAUTH)]
 
 
-def test_login_oauth2_mfa_invalid(monkeypatch, sm_adap):
-    from pyrh.exceptions import AuthenticationError
+def test_refresh_oauth2_success(sm_adap, sent, oauth):
     from pyrh.models.oauth import OAuthSchema
 
-    monkeypatch.setattr("builtins.input", lambda: "123456")
-    responses = [
-        {"mfa_required": True, "mfa_type": "app"},
-        {"detail": "Please enter a valid code"},
-        {"detail": "Please enter a valid code"},
-        {"detail": "Please enter a valid code"},
-    ]
-    expected = [
-        {"text": OAuthSchema().dumps(responses[0]), "status_code": 200},
-        {"text": OAuthSchema().dumps(responses[1]), "status_code": 401},
-        {"text": OAuthSchema().dumps(responses[2]), "status_code": 401},
-        {"text": OAuthSchema().dumps(responses[3]), "status_code": 401},
-    ]
-    sm, adapter = sm_adap
-    adapter.register_uri("POST", MOCK_URL, expected)
-    with pytest.raises(AuthenticationError) as e:
-        sm._login_oauth2()
-
-    assert "Too many incorrect" in str(e.value)
-
-
-def test_refresh_oauth2_success(sm_adap):
-    from pyrh.models.oauth import OAuthSchema
-
-    response = {
-        "access_token": "some_token",
-        "expires_in": 86400,
-        "token_type": "Bearer",
-        "scope": "internal",
-        "refresh_token": "some_refresh_token",
-        "mfa_code": None,
-        "backup_code": None,
-    }
-    sm, adapter = sm_adap
-    sm.oauth.access_token = "some_token"
-    sm.oauth.refresh_token = "some_refresh_token"
-    adapter.register_uri(
-        "POST", MOCK_URL, text=OAuthSchema().dumps(response), status_code=200
-    )
+    response = {**TOKEN_OK, "expires_in": 86400}
+    sm, pending = sm_adap
+    sm.oauth = oauth
+    pending.append({"text": OAuthSchema().dumps(response), "status_code": 200})
 
     sm.refresh_token = "some_token"
     sm.session.headers["Authorization"] = "Bearer some_token"
     sm._refresh_oauth2()
 
     assert sm.oauth.is_valid
+    assert sent == [("POST", MOCK_OAUTH)]
 
 
-def test_refresh_oauth2_failure(sm_adap):
-    from pyrh.exceptions import AuthenticationError
+def test_refresh_oauth2_failure(sm_adap, oauth):
     from pyrh.models.oauth import OAuthSchema
 
     response = {"error": "some_error"}
-    sm, adapter = sm_adap
-    sm.oauth.access_token = "some_token"
-    sm.oauth.refresh_token = "some_refresh_token"
-    adapter.register_uri(
-        "POST", MOCK_URL, text=OAuthSchema().dumps(response), status_code=401
-    )
+    sm, pending = sm_adap
+    sm.oauth = oauth
+    pending.append({"text": OAuthSchema().dumps(response), "status_code": 401})
 
     sm.refresh_token = "some_token"
     sm.session.headers["Authorization"] = "Bearer some_token"
-    with pytest.raises(AuthenticationError) as e:
+    with raises_auth_error("Failed to refresh"):
         sm._refresh_oauth2()
 
-    assert "Failed to refresh" in str(e.value)
-
 
 @mock.patch("pyrh.models.SessionManager._login_oauth2")
 def test_login_init(login_mock, sm):
@@ -320,10 +380,9 @@ def test_login_init(login_mock, sm):
 
 
 @mock.patch("pyrh.models.SessionManager._refresh_oauth2")
-def test_login_refresh_default(refresh_mock, sm):
+def test_login_refresh_default(refresh_mock, sm, oauth):
     # default expires_at is 1970
-    sm.oauth.access_token = "some_token"
-    sm.oauth.refresh_token = "some_refresh_token"
+    sm.oauth = oauth
     sm.session.headers["Authorization"] = "Bearer some_token"
     sm.login()
 
@@ -331,9 +390,8 @@ def test_login_refresh_default(refresh_mock, sm):
 
 
 @mock.patch("pyrh.models.SessionManager._refresh_oauth2")
-def test_login_refresh_force(refresh_mock, sm):
-    sm.oauth.access_token = "some_token"
-    sm.oauth.refresh_token = "some_refresh_token"
+def test_login_refresh_force(refresh_mock, sm, oauth):
+    sm.oauth = oauth
     sm.session.headers["Authorization"] = "Bearer some_token"
     sm.login(force_refresh=True)
 
@@ -341,56 +399,84 @@ def test_login_refresh_force(refresh_mock, sm):
 
 
 @mock.patch("pyrh.models.SessionManager.post")
-def test_logout_success(post_mock, sm):
+def test_logout_success(post_mock, sm, oauth):
     post_mock.return_value = {}
-    sm.oauth.access_token = "some_token"
-    sm.oauth.refresh_token = "some_refresh_token"
+    sm.oauth = oauth
     sm.logout()
     assert post_mock.call_count == 1
 
 
 @mock.patch("pyrh.models.SessionManager.post")
-def test_logout_failure(post_mock, sm):
-    from pyrh.exceptions import AuthenticationError
+def test_logout_failure(post_mock, sm, oauth):
     from requests.exceptions import HTTPError
 
     def raise_error(*args, **kwargs):
         raise HTTPError
 
     post_mock.side_effect = raise_error
-    sm.oauth.access_token = "some_token"
-    sm.oauth.refresh_token = "some_refresh_token"
-    with pytest.raises(AuthenticationError) as e:
+    sm.oauth = oauth
+    with raises_auth_error("^Could not log out$"):
         sm.logout()
 
     assert sm.oauth.access_token == "some_token"
     assert sm.oauth.refresh_token == "some_refresh_token"
     assert post_mock.call_count == 1
-    assert "Could not log out" == str(e.value)
 
 
-def test_jsonify(tmpdir, sm):
+def test_jsonify(tmpdir, sm, oauth, json_backend):
     from pyrh import dump_session, load_session
     from pyrh.exceptions import InvalidCacheFile
 
-    sm.oauth.access_token = "some_token"
-    sm.oauth.refresh_token = "some_refresh_token"
+    sm.oauth = oauth
     file = tmpdir.join("login.json")
     file.ensure(file=True)  # this will likely migrate to pathlib at some point
 
-    with pytest.raises(InvalidCacheFile) as e:
+    with pytest.raises(InvalidCacheFile, match=CACHE_FILE_ERROR):
         load_session(file)
 
-    assert "The cache file at" in str(e.value)
-
     dump_session(sm, file)
     sm1 = load_session(file)
 
+    # both json backends write the same layout
+    text = file.read_text("utf-8")
+    assert text == json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+
     # TODO: make this test a bit more robust
     assert sm.oauth == sm1.oauth
 
 
-@freeze_time("2000-01-01")
+def test_dump_session_creates_directory(tmpdir, sm):
+    from pyrh import dump_session
+
+    file = tmpdir.join("cache", "login.json")
+    dump_session(sm, file)
+
+    assert file.check(file=True)
+
+
+def test_dump_session_failure_removes_temp_file(tmpdir, sm):
+    from pyrh import dump_session
+
+    file = tmpdir.join("login.json")
+    with mock.patch("os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError, match="disk full"):
+            dump_session(sm, file)
+
+    assert tmpdir.listdir() == []
+
+
+def test_load_session_invalid_schema(tmpdir):
+    from pyrh import load_session
+    from pyrh.exceptions import InvalidCacheFile
+
+    file = tmpdir.join("login.json")
+    file.write('{"username": "not an email", "password": "some password"}')
+
+    with pytest.raises(InvalidCacheFile, match=CACHE_FILE_ERROR):
+        load_session(file)
+
+
+@time_machine.travel("2000-01-01", tick=False)
 def test_authenticated(sm, monkeypatch):
     import pytz
     from datetime import datetime as dt, timedelta
@@ -411,12 +497,8 @@ def test_authenticated(sm, monkeypatch):
 
 @mock.patch("pyrh.models.SessionManager.login")
 def test_get(mock_login, sm):
-    import json
-
     from requests.exceptions import HTTPError
 
-    adapter = requests_mock.Adapter()
-    sm.session.mount("mock", adapter)
     mock_url = "mock://test.com"
     expected = [
         {"text": '{"test": "123"}', "status_code": 200},
@@ -424,47 +506,66 @@ def test_get(mock_login, sm):
         {"text": '{"test": "321"}', "status_code": 200},
         {"text": '{"error": "resource not found"}', "status_code": 404},
     ]
-    adapter.register_uri("GET", mock_url, expected)
+    sm.session.mount("mock", CannedAdapter(expected))
 
     resp1 = sm.get(mock_url)
     resp2 = sm.get(mock_url)
 
-    with pytest.raises(HTTPError) as e:
+    with pytest.raises(HTTPError, match=NOT_FOUND_ERROR):
         sm.get(mock_url)
 
     assert resp1 == json.loads(expected[0]["text"])
     assert resp2 == json.loads(expected[2]["text"])
     assert mock_login.call_count == 1
-    assert "404 Client Error" in str(e.value)
 
 
 @mock.patch("pyrh.models.SessionManager.login")
 def test_post(mock_login, sm):
-    import json
-
     from requests.exceptions import HTTPError
 
-    adapter = requests_mock.Adapter()
-    sm.session.mount("mock", adapter)
     mock_url = "mock://test.com"
     expected = [
         {"text": '{"error": "login error"}', "status_code": 401},
         {"text": '{"test": "321"}', "status_code": 200},
         {"text": '{"error": "resource not found"}', "status_code": 404},
     ]
-    adapter.register_uri("POST", mock_url, expected)
+    sm.session.mount("mock", CannedAdapter(expected))
 
     resp1 = sm.post(mock_url)
 
-    with pytest.raises(HTTPError) as e:
+    with pytest.raises(HTTPError, match=NOT_FOUND_ERROR):
         sm.post(mock_url)
 
     assert resp1 == json.loads(expected[1]["text"])
     assert mock_login.call_count == 1
-    assert "404 Client Error" in str(e.value)
 
 
-@freeze_time("2020-01-01")
+def test_decode_json(json_backend):
+    from pyrh.models.sessionmanager import _decode_json
+
+    res = requests.Response()
+    res.encoding = "utf-8"
+    res._content = b'{"test": "123"}'
+
+    assert _decode_json(res) == {"test": "123"}
+
+
+def test_decode_json_invalid(json_backend):
+    from pyrh.models.sessionmanager import _decode_json
+
+    res = requests.Response()
+    res.encoding = "utf-8"
+    res._content = b"not json"
+    with pytest.raises(ValueError) as expected:
+        res.json()
+
+    with pytest.raises(ValueError) as excinfo:
+        _decode_json(res)
+
+    assert excinfo.type is expected.type
+
+
+@time_machine.travel("2020-01-01", tick=False)
 def test_token_expired(sm):
     from datetime import datetime
     import pytz